@@ -10,7 +10,6 @@ class NFA:
         self.transitions = transitions 
         self.start_state = start_state
         self.accept_states = set(accept_states)
-        self._epsilon_closures = {} 
 
         if self.start_state not in self.states:
 
@@ -22,70 +21,189 @@ class NFA:
              if symbol is not None and symbol not in self.alphabet:
                  raise ValueError(f"Symbol '{symbol}' used in transitions but not in defined alphabet {self.alphabet}.")
 
-        self._compute_all_epsilon_closures()
-
-    def _compute_epsilon_closure(self, state):
-        """Computes the epsilon closure for a single state using BFS."""
-        if state in self._epsilon_closures:
-            return self._epsilon_closures[state]
-
-        closure = {state}
-        queue = collections.deque([state])
-        visited = {state}
-
-        while queue:
-            current_state = queue.popleft()
-            epsilon_neighbors = self.transitions.get((current_state, None), set())
-
-            for neighbor in epsilon_neighbors:
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    closure.add(neighbor)
-                    queue.append(neighbor)
+        for (state, _), targets in self.transitions.items():
+            if state not in self.states or not self.states.issuperset(targets):
+                raise ValueError(f"Transition from '{state}' to {targets} uses states not in defined states {self.states}.")
+
+        # States are renumbered to dense ids so that state sets can be held as int bitmasks.
+        self._state_list = list(self.states)
+        self._state_id = {s: i for i, s in enumerate(self._state_list)}
+        self._accept_mask = self._mask_of(self.accept_states)
+
+        # Symbols get ids from 1 so that column 0 of the successor table holds the epsilon transitions.
+        # The table is stored column-major: one contiguous list per symbol, indexed by state id.
+        self._sym_id = {s: i for i, s in enumerate(self.alphabet, 1)}
+        self._tbl = [[0] * len(self._state_list) for _ in range(len(self._sym_id) + 1)]
+        for (state, symbol), targets in self.transitions.items():
+            column = 0 if symbol is None else self._sym_id[symbol]
+            self._tbl[column][self._state_id[state]] |= self._mask_of(targets)
+
+        # Input is translated to symbol ids through a byte table when it is ASCII. Characters outside the
+        # alphabet become id 0, which is never a real symbol; see _intern_state_set.
+        self._sym_lut = None
+        if len(self._sym_id) < 256:
+            lut = bytearray(256)
+            for symbol, symbol_id in self._sym_id.items():
+                if isinstance(symbol, str) and len(symbol) == 1 and ord(symbol) < 128:
+                    lut[ord(symbol)] = symbol_id
+            self._sym_lut = bytes(lut)
+
+        self._compute_live_states()
+
+        # Maps every single-character symbol to None, so str.translate leaves behind only characters outside the alphabet.
+        self._alphabet_deletions = dict.fromkeys(ord(s) for s in self.alphabet if isinstance(s, str) and len(s) == 1)
+
+        # Every closed set of states is hash-consed to a dense id. The ids double as DFA states,
+        # whose transitions are discovered lazily during simulation and shared across calls to accepts.
+        self._intern = {}
+        self._dfa_masks = []
+        self._dfa_trans = []
+        self._dfa_accept = []
+        self._dfa_dead = self._intern_state_set(0)
 
-        self._epsilon_closures[state] = frozenset(closure)
-        return self._epsilon_closures[state]
+        self._compute_all_epsilon_closures()
+        self._compute_move_closure_tables()
+        self._dfa_start = self._closure_set_cache[1 << self._state_id[self.start_state]]
+
+        self._str_cache = None
+
+    def _mask_of(self, states):
+        """Converts an iterable of states into a bitmask of their ids."""
+        mask = 0
+        for s in states:
+            mask |= 1 << self._state_id[s]
+        return mask
+
+    def _compute_live_states(self):
+        """Pre-computes the bitmask of states from which an accept state is reachable, by reverse BFS."""
+        predecessors = [0] * len(self._state_list)
+        for column in self._tbl:
+            for i, successors in enumerate(column):
+                bits = successors
+                while bits:
+                    lsb = bits & -bits
+                    predecessors[lsb.bit_length() - 1] |= 1 << i
+                    bits ^= lsb
+
+        live = frontier = self._accept_mask
+        while frontier:
+            lsb = frontier & -frontier
+            frontier ^= lsb
+            new_states = predecessors[lsb.bit_length() - 1] & ~live
+            live |= new_states
+            frontier |= new_states
+
+        self._live_mask = live
 
     def _compute_all_epsilon_closures(self):
-        """Pre-computes epsilon closures for all states."""
-        for state in self.states:
-            self._compute_epsilon_closure(state) 
-
-    def _get_epsilon_closure_set(self, states_set):
-        """Computes the epsilon closure for a set of states."""
-        full_closure = set()
-        for s in states_set:
-
-            full_closure.update(self._epsilon_closures.get(s, {s})) 
+        """Pre-computes epsilon closures for all states using Warshall's algorithm over row bitmasks."""
+        closures = [(1 << i) | successors for i, successors in enumerate(self._tbl[0])]
+
+        # A state without epsilon successors never extends another closure, so only the others are used as pivots.
+        pivots = [k for k, row in enumerate(closures) if row != 1 << k]
+        for k in pivots:
+            k_bit = 1 << k
+            k_row = closures[k]
+            for i, row in enumerate(closures):
+                if row & k_bit:
+                    closures[i] = row | k_row
+
+        self._eclose_mask = closures
+        # Singleton and empty sets are by far the most common queries, so seed them into the set cache.
+        self._closure_set_cache = {1 << i: self._intern_state_set(row) for i, row in enumerate(closures)}
+        self._closure_set_cache[0] = self._dfa_dead
+
+    def _get_epsilon_closure_set(self, states_mask):
+        """Computes the epsilon closure for a bitmask of states and returns its interned id."""
+        full_closure = self._closure_set_cache.get(states_mask)
+        if full_closure is not None:
+            return full_closure
+
+        full_closure = 0
+        bits = states_mask
+        while bits:
+            lsb = bits & -bits
+            full_closure |= self._eclose_mask[lsb.bit_length() - 1]
+            bits ^= lsb
+
+        full_closure = self._intern_state_set(full_closure)
+        self._closure_set_cache[states_mask] = full_closure
         return full_closure
 
-    def accepts(self, input_string):
-        """Checks if the NFA accepts the given input string."""
-        current_states = self._get_epsilon_closure_set({self.start_state})
-
-        for symbol in input_string:
+    def _compute_move_closure_tables(self):
+        """Pre-computes the interned epsilon closure of each state's successors on every symbol."""
+        # Laid out like the successor table, indexed by [symbol id][state id].
+        self._move_eclose = [[self._get_epsilon_closure_set(successors) for successors in column] for column in self._tbl]
+
+    def _intern_state_set(self, states_mask):
+        """Returns the id of a closed bitmask of NFA states, assigning the next dense id if new."""
+        # States that cannot reach an accept state never affect acceptance, so they are dropped. A set
+        # left with no live states becomes the dead state, letting _run reject without reading further.
+        states_mask &= self._live_mask
+        dfa_state = self._intern.get(states_mask)
+        if dfa_state is None:
+            dfa_state = len(self._dfa_masks)
+            self._intern[states_mask] = dfa_state
+            self._dfa_masks.append(states_mask)
+            # The dead state is always interned first, so id 0 is dead; so is every transition on symbol id 0.
+            self._dfa_trans.append([0] + [None] * len(self._sym_id))
+            self._dfa_accept.append(bool(states_mask & self._accept_mask))
+        return dfa_state
+
+    def _compute_dfa_transition(self, dfa_state, symbol_id):
+        """Computes and records the DFA transition from dfa_state on the symbol with id symbol_id."""
+        move_eclose = self._move_eclose[symbol_id]
+        dfa_masks = self._dfa_masks
+        next_states = 0
+        bits = dfa_masks[dfa_state]
+        while bits:
+            lsb = bits & -bits
+            next_states |= dfa_masks[move_eclose[lsb.bit_length() - 1]]
+            bits ^= lsb
+
+        next_dfa_state = self._intern_state_set(next_states)
+        self._dfa_trans[dfa_state][symbol_id] = next_dfa_state
+        return next_dfa_state
+
+    def _run(self, dfa_state, symbol_ids):
+        """Advances dfa_state over a sequence of symbol ids and returns the DFA state reached."""
+        # Everything touched per character is bound to a local to keep the loop free of attribute lookups.
+        dfa_trans = self._dfa_trans
+        compute_transition = self._compute_dfa_transition
+        dead = self._dfa_dead
+
+        for symbol_id in symbol_ids:
+            next_dfa_state = dfa_trans[dfa_state][symbol_id]
+            if next_dfa_state is None:
+                next_dfa_state = compute_transition(dfa_state, symbol_id)
+            dfa_state = next_dfa_state
+
+            if dfa_state == dead:
+                return dead 
+
+        return dfa_state
+
+    def invalid_symbols(self, input_string):
+        """Returns the set of characters in input_string that are not in the NFA's alphabet."""
+        return set(input_string.translate(self._alphabet_deletions))
 
-            if symbol not in self.alphabet:
-                print(f"Warning: Input symbol '{symbol}' is not in the NFA's alphabet {self.alphabet}. String will be rejected.")
-                return False 
-
-            next_states_after_symbol = set()     
-            for state in current_states:
-                next_states_for_state = self.transitions.get((state, symbol), set())
-                next_states_after_symbol.update(next_states_for_state)
-
-            current_states = self._get_epsilon_closure_set(next_states_after_symbol)
-
-            if not current_states:
-                return False 
+    def accepts(self, input_string):
+        """Checks if the NFA accepts the given input string. Strings with symbols outside the alphabet are rejected."""
+        if self._sym_lut is not None and input_string.isascii():
+            symbol_ids = input_string.encode("ascii").translate(self._sym_lut)
+        else:
+            sym_id = self._sym_id
+            symbol_ids = (sym_id.get(symbol, 0) for symbol in input_string)
 
-        return not current_states.isdisjoint(self.accept_states)
+        return self._dfa_accept[self._run(self._dfa_start, symbol_ids)]
 
     def __str__(self):
-        """String representation for debugging."""
+        """String representation for debugging, built on first use since the NFA does not change after construction."""
+        if self._str_cache is not None:
+            return self._str_cache
 
         transitions_str = "\n    ".join(f"{k}: {v}" for k, v in sorted(self.transitions.items()))
-        return (
+        self._str_cache = (
             f"NFA(\n"
             f"  States: {sorted(list(self.states))}\n"
             f"  Alphabet: {sorted(list(self.alphabet))}\n"
@@ -94,6 +212,12 @@ class NFA:
             f"  Accept States: {sorted(list(self.accept_states))}\n"
             f")"
         )
+        return self._str_cache
+
+# A rule splits on its first '->'. A production is 'epsilon' (ASCII, any case), 'ε', a terminal, or a terminal
+# followed by a non-terminal; symbols themselves are validated against the declared sets.
+_RULE_RE = re.compile(r"(.*?)\s*->\s*(.*)", re.DOTALL)
+_PRODUCTION_RE = re.compile(r"(?ai:epsilon)|ε|(.)(.)?", re.DOTALL)
 
 def parse_grammar(grammar_lines, declared_non_terminals, declared_terminals, declared_start_symbol):
     """
@@ -119,11 +243,11 @@ def parse_grammar(grammar_lines, declared_non_terminals, declared_terminals, dec
         if not line or line.startswith("#"):
             continue
 
-        if "->" not in line:
+        rule_match = _RULE_RE.fullmatch(line)
+        if rule_match is None:
             raise ValueError(f"Rule {line_num}: Invalid format (missing '->'): {line}")
 
-        head, body = line.split("->", 1)
-        head = head.strip()
+        head, body = rule_match.groups()
 
         if not head:
              raise ValueError(f"Rule {line_num}: Rule head cannot be empty.")
@@ -137,32 +261,18 @@ def parse_grammar(grammar_lines, declared_non_terminals, declared_terminals, dec
              raise ValueError(f"Rule {line_num}: Rule body for '{head}' cannot be empty or contain empty productions between '|'. Use 'epsilon'.")
 
         for prod in productions:
-            if prod.lower() == "epsilon" or prod == "ε":
-
-                grammar[head].append((None, None)) 
-            elif len(prod) == 1:
-
-                terminal = prod
-                if terminal not in declared_terminals:
-                     raise ValueError(f"Rule {line_num}: Symbol '{terminal}' in production '{prod}' for '{head}' is not in the declared terminals {declared_terminals}.")
-                grammar[head].append((terminal, None)) 
-            elif len(prod) >= 2: 
-
-                 if len(prod) == 2:
-                    terminal = prod[0]
-                    next_non_terminal = prod[1]
-
-                    if terminal not in declared_terminals:
-                        raise ValueError(f"Rule {line_num}: Symbol '{terminal}' in production '{prod}' for '{head}' is not in the declared terminals {declared_terminals}.")
-                    if next_non_terminal not in declared_non_terminals:
-                         raise ValueError(f"Rule {line_num}: Symbol '{next_non_terminal}' in production '{prod}' for '{head}' is not in the declared non-terminals {declared_non_terminals}.")
+            prod_match = _PRODUCTION_RE.fullmatch(prod)
+            if prod_match is None:
+                raise ValueError(f"Rule {line_num}: Invalid production format '{prod}' in rule for '{head}'. Expected 'terminal', 'epsilon', or 'terminal NonTerminal' (e.g., aB).")
 
-                    grammar[head].append((terminal, next_non_terminal))
-                 else: 
-                     raise ValueError(f"Rule {line_num}: Invalid production format '{prod}' in rule for '{head}'. Expected 'terminal', 'epsilon', or 'terminal NonTerminal' (e.g., aB).")
+            terminal, next_non_terminal = prod_match.groups()
+            if terminal is not None and terminal not in declared_terminals:
+                raise ValueError(f"Rule {line_num}: Symbol '{terminal}' in production '{prod}' for '{head}' is not in the declared terminals {declared_terminals}.")
+            if next_non_terminal is not None and next_non_terminal not in declared_non_terminals:
+                raise ValueError(f"Rule {line_num}: Symbol '{next_non_terminal}' in production '{prod}' for '{head}' is not in the declared non-terminals {declared_non_terminals}.")
 
-            else: 
-                raise ValueError(f"Rule {line_num}: Unexpected production format '{prod}' for '{head}'.")
+            # Epsilon yields (None, None), a lone terminal (terminal, None), and a terminal plus non-terminal both.
+            grammar[head].append((terminal, next_non_terminal))
 
     return dict(grammar)
 
@@ -289,10 +399,9 @@ def main():
                 if not input_string and input_string != "": 
                     break
 
-                is_valid_input = all(char in nfa.alphabet for char in input_string)
+                invalid_chars = nfa.invalid_symbols(input_string)
 
-                if not is_valid_input:
-                    invalid_chars = {char for char in input_string if char not in nfa.alphabet}
+                if invalid_chars:
                     print(f"String '{input_string}': Rejected (Contains symbols not in alphabet: {invalid_chars})")
                 else:
 